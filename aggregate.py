@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+bin_responded = [0, 10, 30, 60, np.inf]
+label_responded = ['0-10mins', '10-30mins', '30-60mins', '60-np.inf']
+
+bin_recovered = [0, 60, 240, 480, np.inf]
+label_recovered = ['0-1hr', '1-4hrs', '4-8hrs', '8-np.inf']
+
+def codes(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    return series.cat.codes.to_numpy(), series.cat.categories
+
+
+def crosstab(df, bucket, dim):
+    """Dense (KPI bucket x dimension) count matrix built with a single bincount.
+
+    Rows follow the bucket order, columns are the observed dimension values
+    ordered by total count, so the same frame feeds the tables and the stacked bars.
+    """
+    row_codes, row_labels = codes(df[bucket])
+    col_codes, col_labels = codes(df[dim])
+    valid = (row_codes >= 0) & (col_codes >= 0)
+    flat = row_codes[valid].astype(np.int64)*len(col_labels) + col_codes[valid]
+    counts = np.bincount(flat, minlength=len(row_labels)*len(col_labels)).reshape(len(row_labels), len(col_labels))
+
+    totals = counts.sum(axis=0)
+    order = np.argsort(-totals, kind='stable')
+    order = order[totals[order] > 0]
+    return pd.DataFrame(counts[:, order],
+                        index=pd.Index(row_labels, name=bucket),
+                        columns=pd.Index(col_labels[order], name=dim))
+
+
+# ------name: (column, statistic, scale), durations are reported in hours------
+metrics = {
+    'Fault_Acknowledged_count': ('Time_Acknowledged_mins', 'count', 1),
+    'Fault_Acknowledged_mean(hrs)': ('Time_Acknowledged_mins', 'mean', 1/60),
+    'Fault_Acknowledged_sum(hrs)': ('Time_Acknowledged_mins', 'sum', 1/60),
+    'Fault_Site_Reached_count': ('Time_Site_Reached_mins', 'count', 1),
+    'Fault_Site_Reached_mean(hrs)': ('Time_Site_Reached_mins', 'mean', 1/60),
+    'Fault_Site_Reached_sum(hrs)': ('Time_Site_Reached_mins', 'sum', 1/60),
+    'Fault_Work_Started_count': ('Time_Work_Started_mins', 'count', 1),
+    'Fault_Work_Started_mean(hrs)': ('Time_Work_Started_mins', 'mean', 1/60),
+    'Fault_Work_Started_sum(hrs)': ('Time_Work_Started_mins', 'sum', 1/60),
+    'Fault_Recovered_count': ('Time_Work_Recovered_mins', 'count', 1),
+    'Fault_Recovered_mean(hrs)': ('Time_Work_Recovered_mins', 'mean', 1/60),
+    'Fault_Recovered_sum(hrs)': ('Time_Work_Recovered_mins', 'sum', 1/60),
+}
+
+tier_metrics = ['Fault_Acknowledged_count', 'Fault_Acknowledged_mean(hrs)', 'Fault_Acknowledged_sum(hrs)',
+                'Fault_Recovered_count', 'Fault_Recovered_mean(hrs)', 'Fault_Recovered_sum(hrs)']
+
+
+def breakdown(df, dim, names=tier_metrics):
+    """One grouped pass computing only the requested `metrics`; tidy frame with `dim` as a column."""
+    out = df.groupby(dim, observed=True).agg(**{name: metrics[name][:2] for name in names})
+    for name in names:
+        scale = metrics[name][2]
+        if scale != 1:
+            out[name] *= scale
+    return out.reset_index()
+
+
+def fold(frame, dim, name, n=10, other='Other'):
+    """Top `n` rows by `name` plus one `other` row aggregating the remainder.
+
+    Counts and sums of the remainder are added up; means are re-weighted by
+    their matching count column when the frame carries it.
+    """
+    top = frame.nlargest(n, name)
+    if len(frame) <= n:
+        return top
+    rest = frame.drop(top.index)
+    row = {dim: other}
+    for column in frame.columns.drop(dim):
+        stat = metrics[column][1] if column in metrics else 'sum'
+        count = column.replace('_mean(hrs)', '_count')
+        if stat == 'mean' and count in rest:
+            row[column] = (rest[column]*rest[count]).sum()/rest[count].sum()
+        elif stat == 'mean':
+            row[column] = rest[column].mean()
+        else:
+            row[column] = rest[column].sum()
+    top[dim] = top[dim].astype(object)
+    return pd.concat([top, pd.DataFrame([row])], ignore_index=True)
+
+
+def fold_columns(matrix, n=20, other='Other'):
+    """Keep the `n` largest columns of a count matrix and sum the rest into `other`."""
+    if matrix.shape[1] <= n:
+        return matrix
+    totals = matrix.sum().to_numpy()
+    keep = np.sort(np.argpartition(-totals, n - 1)[:n])
+    out = matrix.iloc[:, keep].copy()
+    out[other] = matrix.drop(columns=matrix.columns[keep]).sum(axis=1)
+    out.columns.name = matrix.columns.name
+    return out
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import charts
+import cube
+import drilldown
+import filters
+import loader
+import pipeline
+import snapshot
+
+SITE = 'Gardens By The Bay (South)'
+
+# ------vocabulary of the synthetic exports, shaped like the real Fault_* exports------
+trades = {
+    'Electrical': ['Socket', 'Light Switches', 'Miniature Circuit Breaker', 'Lightning Protection System',
+                   'Electromagnetic Lock', 'LED Lights', 'Junction Box', 'Lamp Post', 'Light Fitting', 'HTLV',
+                   'Socket Outlet', 'Light Driver / Ballast', 'Screen / Projector', 'Earthing', 'Light Bulb',
+                   'Door Controller', 'Fan', 'Earth-leakage Circuit Breaker', 'Cable and Trunking', 'Card Reader',
+                   'Light Driver', 'Exit light'],
+    'Building': ['Carpet', 'Vehicle Barrier System', 'Glass Door', 'Door Lock', 'Floor', 'Signage',
+                 'Door Knob / Handle', 'Ceiling Board Access Panel'],
+    'Plumbing & Sanitary': ['Bottle Trap', 'Tap', 'Water Pipe', 'Flush Button', 'Bidet spray / Hose', 'Basin / sink',
+                            'Urinal', 'Hand Dryer', 'WC / Squatting Pedestal'],
+    'Mechanical': ['Lift / Crane Hoist - Passenger / Goods Lift', 'Air Conditioning System', 'Smoke Detector',
+                   'Rain Curtain', 'Roller Shutter', 'Pump', 'Fire Alarm / Detection System'],
+    'Building Security System': ['CCTV System'],
+    'Office and Furniture': ['Cabinet/Wardrobe/Drawer & lockset'],
+    'Cleaning': ['Exterior'],
+}
+trade_weights = [49, 33, 20, 18, 8, 1, 1]
+
+fault_types = ['Unable to open or close properly', 'Tripped / Short-Circuit / Overloaded', 'Flickering / Blown',
+               'Too hot / Too cold', 'Unserviceable', 'Leaking', 'Choked', 'Loose', 'Broken', 'Bent', 'Noisy',
+               'Missing', 'Stained', 'No power']
+OTHER_FAULTS = 500
+
+impacts = ['Affecting Public', 'Localised to room', 'WIthin Building', 'More than 1 room']
+impact_weights = [92, 32, 4, 2]
+
+buildings = ['Flower Dome', 'Cloud Forest', 'Supertree Grove', 'Floral Fantasy', 'GBHQ', 'Bayfront', 'Active Garden',
+             'Satay by the Garden', 'Service Tunnel', 'Carparks', 'Other Outdoor Area', 'Kingfisher Wetlands',
+             'Dragonfly Bridge', 'Meadow', 'Children Garden']
+LEVELS = 6
+ROOMS = 40
+
+# ------gaps between consecutive milestones: (median minutes, lognormal sigma)------
+gaps = {'Fault_Acknowledged_Date': ('Reported_Date', 2, 1.8),
+        'Responded_on_Site_Date': ('Fault_Acknowledged_Date', 40, 1.2),
+        'RA_Conducted_Date': ('Responded_on_Site_Date', 1, 0.8),
+        'Work_Started_Date': ('RA_Conducted_Date', 1, 0.8),
+        'Work_Completed_Date': ('Work_Started_Date', 30, 1.5)}
+
+UNACKNOWLEDGED_RATE = 0.01
+OUTSTANDING_RATE = 0.02
+CANCEL_RATE = 0.02
+PRIORITY_RATE = 0.11
+REMARKS_RATE = 0.02
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+XLSX_MAX_ROWS = 100000
+
+
+def _pick(rng, values, size, weights=None):
+    p = None if weights is None else np.asarray(weights, dtype=float)/sum(weights)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
+
+
+def locations(rng, size):
+    """Site > Building, Site > Building > Level, or Site > Building > Level > Room."""
+    building = _pick(rng, buildings, size)
+    level = np.char.add('Level ', rng.integers(1, LEVELS + 1, size).astype(str)).astype(object)
+    room = np.char.add('Room ', rng.integers(1, ROOMS + 1, size).astype(str)).astype(object)
+    depth = rng.choice(3, size=size, p=[0.4, 0.2, 0.4])
+    out = SITE + ' > ' + building
+    out = np.where(depth >= 1, out + ' > ' + level, out)
+    return np.where(depth == 2, out + ' > ' + room, out)
+
+
+def generate(rows, seed=0, start='2021-01-01', months=12):
+    """Synthetic fault rows in the shape loader.read_faults returns, reported uniformly over `months`."""
+    rng = np.random.default_rng(seed)
+    names = list(trades)
+    trade = rng.choice(len(names), size=rows, p=np.asarray(trade_weights)/sum(trade_weights))
+    category = np.empty(rows, dtype=object)
+    for i, name in enumerate(names):
+        hit = trade == i
+        category[hit] = _pick(rng, trades[name], int(hit.sum()))
+
+    other = np.char.add('Other: issue ', rng.integers(0, OTHER_FAULTS, rows).astype(str)).astype(object)
+    fault_type = np.where(rng.random(rows) < 0.2, other, _pick(rng, fault_types, rows))
+
+    df = pd.DataFrame({'Building_Trade': np.asarray(names, dtype=object)[trade],
+                       'Trade_Category': category,
+                       'Type_of_Fault': fault_type,
+                       'Impact': _pick(rng, impacts, rows, impact_weights),
+                       'Location': locations(rng, rows)},
+                      index=pd.Index(np.char.add('FID', np.arange(1, rows + 1).astype(str)).astype(object),
+                                     name='Fault Number'))
+
+    cancelled = rng.random(rows) < CANCEL_RATE
+    df['Cancel_Status'] = np.where(cancelled, 'approved', None)
+
+    span = (pd.Timestamp(start) + pd.DateOffset(months=months) - pd.Timestamp(start))/pd.Timedelta(seconds=1)
+    reported = pd.Timestamp(start) + pd.to_timedelta(np.sort(rng.random(rows))[::-1]*span, unit='s')
+    df['Reported_Date'] = reported.floor('s')
+
+    # ------each milestone follows the previous one; once one is missing, the later ones are too------
+    stopped = rng.random(rows) < UNACKNOWLEDGED_RATE
+    for col, (previous, median, sigma) in gaps.items():
+        if col == 'Work_Completed_Date':
+            stopped |= rng.random(rows) < OUTSTANDING_RATE
+        minutes = rng.lognormal(np.log(median), sigma, rows)
+        df[col] = (df[previous] + pd.to_timedelta(minutes*60, unit='s')).dt.floor('s').where(~stopped)
+    df['Work_Completed_Date'] = df.Work_Completed_Date.where(~cancelled)
+
+    for col in ['Other_Trades_Required_Date', 'Cost_Cap_Exceed_Date', 'Assistance_Requested_Date']:
+        df[col] = pd.NaT
+    df['Fault_Reference'] = np.nan
+    df['End_User_Priority'] = np.where(rng.random(rows) < PRIORITY_RATE, rng.integers(1, 4, rows), np.nan)
+    df['Incident_Report'] = np.nan
+    df['Remarks'] = np.where(rng.random(rows) < REMARKS_RATE, 'Reported by visitor services', None)
+    return df[[col.replace(' ', '_') for col in loader.cols[1:]]]
+
+
+def write_export(df, path):
+    """Write `df` as a Fault_*.xlsx export: a title row, then the header, then one row per fault."""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Fault')
+    ws.append(['Fault'])
+    ws.append(loader.cols)
+    out = df.reset_index()
+    for record in out.astype(object).where(out.notna(), None).itertuples(index=False, name=None):
+        ws.append([value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in record])
+    wb.save(path)
+
+
+def timed(fn, repeat):
+    """Best of `repeat` wall-clock seconds for fn(), and its last result."""
+    best, result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(rows, folder, repeat=3, xlsx_max=XLSX_MAX_ROWS, seed=0):
+    """{stage: seconds} of the headless pipeline on `rows` synthetic faults, and {frame: MiB} of the
+    fully derived frame against the compact working frame."""
+    out = {}
+    raw = generate(rows, seed)
+    path = os.path.join(folder, 'Fault_Jan_2021.xlsx')
+
+    if rows <= xlsx_max:
+        write_export(raw, path)
+        digest = loader.fingerprint(path)[-1]
+        out['ingest.xlsx'], _ = timed(lambda: loader.read_faults(path), 1)
+        out['ingest.stream'], _ = timed(lambda: loader.stream_ingest(path, digest), 1)
+    out['derive'], derived = timed(lambda: loader.derive(raw.copy()), repeat)
+    out['snapshot.write'], _ = timed(lambda: snapshot.write(derived, path, 'bench'), 1)
+    out['cube'], daily = timed(lambda: cube.build(derived), repeat)
+    out['snapshot.read'], df = timed(lambda: loader.compact(snapshot.read(path, 'bench', columns=loader.frame_cols)), repeat)
+    out['index'], index = timed(lambda: filters.FilterIndex(df), repeat)
+    memory = {'derived': derived.memory_usage(index=True, deep=True).sum()/2**20,
+              'frame': df.memory_usage(index=True, deep=True).sum()/2**20}
+
+    building_trades = index.options('Building_Trade')[1:]
+    trade_categories = index.options('Trade_Category')[::2]
+    out['filter'], mask = timed(lambda: pipeline.select(index, building_trades, trade_categories), repeat)
+    out['aggregate.base'], df3 = timed(lambda: pipeline.recovered(df, mask), repeat)
+    for name, build in pipeline.sections.items():
+        out[f'aggregate.{name}'], _ = timed(lambda: build(df3), repeat)
+    out['aggregate.cards'], _ = timed(lambda: cube.cards(cube.select(daily, building_trades, trade_categories)), repeat)
+    out['drill.order'], ordered = timed(lambda: drilldown.order(df['Reported_Date']), repeat)
+    out['drill.page'], _ = timed(lambda: df.take(drilldown.page(drilldown.select(
+        ordered, mask & index.mask({'Trade_Category': trade_categories[:1]}), True), 1))[drilldown.page_cols], repeat)
+    out['aggregate.trend'], trend = timed(lambda: cube.trend(daily, 'Week'), repeat)
+
+    def figures():
+        charts._figures.clear()
+        kpi = pipeline.sections['responded'](df3)
+        tier = pipeline.sections['tier2'](df3)
+        charts.stacked(kpi['category'], 'KPI Monitoring(Responded) vs Trade Category', 'Trade Category')
+        for name, top in tier.items():
+            charts.bar(top['Trade_Category'], top[name], name, 'Trade Category', name, '#fe86a4')
+        charts.line(trend['compliance'], 'KPI Compliance per Week', 'Week', 'Within SLA(%)')
+        return len(charts._figures)
+    out['figures'], _ = timed(figures, repeat)
+    return out, memory
+
+
+def compare(results, baseline):
+    """Lines of 'stage: now vs before (ratio)' for stages present in both runs."""
+    lines = []
+    for stage, seconds in results.items():
+        before = baseline.get(stage)
+        if before:
+            lines.append(f'  {stage:<22} {seconds:9.4f}s vs {before:9.4f}s ({seconds/before:5.2f}x)')
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the dashboard pipeline on synthetic Fault_* exports.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='fault rows per run')
+    parser.add_argument('--repeat', type=int, default=3, help='best of this many runs per stage')
+    parser.add_argument('--xlsx-max', type=int, default=XLSX_MAX_ROWS,
+                        help='largest size also written to and ingested from xlsx (Excel caps sheets at 1048576 rows)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.jsonl', help='append one JSON line per size here')
+    parser.add_argument('--baseline', help='earlier --output file to compare against, size by size')
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            for line in f:
+                record = json.loads(line)
+                baseline[record['rows']] = record['stages']
+
+    started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            results, memory = run(rows, folder, args.repeat, args.xlsx_max, args.seed)
+        record = {'time': started, 'rows': rows, 'repeat': args.repeat, 'python': platform.python_version(),
+                  'pandas': pd.__version__, 'numpy': np.__version__,
+                  'stages': {stage: round(seconds, 6) for stage, seconds in results.items()},
+                  'memory_mib': {name: round(mib, 3) for name, mib in memory.items()}}
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        print(f'{rows} rows')
+        if rows in baseline:
+            print('\n'.join(compare(results, baseline[rows])))
+        else:
+            for stage, seconds in results.items():
+                print(f'  {stage:<22} {seconds:9.4f}s')
+        for name, mib in memory.items():
+            print(f'  memory.{name:<15} {mib:9.1f}MiB')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ------named caches, for hit/miss reporting------
+caches = {}
+
+
+def sizeof(value):
+    """Approximate resident size in bytes of a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRU:
+    """Thread-safe LRU bounded by entry count and, optionally, by total bytes."""
+
+    def __init__(self, max_entries, max_bytes=None, name=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        if name is not None:
+            caches[name] = self
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, build):
+        """Value for `key`, calling `build()` on a miss."""
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key][0]
+            self.misses += 1
+
+        value = build()
+        size = sizeof(value) if self.max_bytes is not None else 0
+
+        with self._lock:
+            self._insert(key, value, size)
+        return value
+
+    def _insert(self, key, value, size):
+        if key in self._items:
+            self.nbytes -= self._items.pop(key)[1]
+        self._items[key] = (value, size)
+        self.nbytes += size
+        while len(self._items) > 1 and (len(self._items) > self.max_entries or
+                                        (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self.nbytes -= self._items.popitem(last=False)[1][1]
+
+    def put(self, key, value):
+        """Store `value` under `key` without building it, e.g. when loading pre-computed entries."""
+        size = sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._insert(key, value, size)
+
+    def items(self):
+        with self._lock:
+            return [(key, value) for key, (value, size) in self._items.items()]
+
+    def stats(self):
+        return {'entries': len(self._items), 'bytes': self.nbytes, 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
@@ -0,0 +1,125 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import filters
+import loader
+import pipeline
+import schedules
+
+FAULT_FILE = re.compile(r'^Fault_([A-Za-z]{3})_(\d{4})\.xlsx$')
+SCHEDULE_FILE = re.compile(r'^schedules_([A-Za-z]{3})_(\d{4})\.xlsx$')
+
+
+def discover(folder='.', pattern=FAULT_FILE):
+    """{month Period: path} for every Fault_<Mon>_<YYYY>.xlsx (or `pattern`) export in `folder`, oldest first."""
+    months = {}
+    for name in os.listdir(folder):
+        match = pattern.match(name)
+        if match:
+            month = pd.Period(f'{match.group(1)} {match.group(2)}', freq='M')
+            months[month] = os.path.join(folder, name)
+    return dict(sorted(months.items()))
+
+
+def partitions(start, end, folder='.', pattern=FAULT_FILE):
+    """Paths of the monthly partitions overlapping [start, end]."""
+    return [path for month, path in discover(folder, pattern).items() if start <= month <= end]
+
+
+def fingerprint(paths):
+    return tuple(loader.fingerprint(path)[-1] for path in paths)
+
+
+def range_fingerprint(start, end, folder='.'):
+    return fingerprint(partitions(start, end, folder))
+
+
+def schedule_fingerprint(start, end, folder='.'):
+    return fingerprint(partitions(start, end, folder, SCHEDULE_FILE))
+
+
+def load_range(start, end, folder='.'):
+    """Fault rows for the months in [start, end]; only the overlapping partitions are read."""
+    paths = partitions(start, end, folder)
+    if not paths:
+        raise FileNotFoundError(f'No Fault_*.xlsx export between {start} and {end} in {folder!r}')
+    def build():
+        if len(paths) == 1:
+            return loader.load_faults(paths[0])
+        df = loader.concat([loader.load_partition(path) for path in paths])
+        df.index = pd.RangeIndex(len(df))
+        return df
+    return loader.cached(('range',) + fingerprint(paths), build)
+
+
+def load_cube(start, end, folder='.'):
+    """Daily cube for the months in [start, end], concatenated from the partition cubes."""
+    paths = partitions(start, end, folder)
+    return loader.cached(('cube',) + fingerprint(paths),
+                         lambda: loader.concat([loader.load_cube(path) for path in paths]).reset_index(drop=True))
+
+
+def load_index(start, end, folder='.'):
+    """Filter index over the rows of load_range(start, end), built once per dataset."""
+    paths = partitions(start, end, folder)
+    return loader.cached(('index',) + fingerprint(paths),
+                         lambda: filters.FilterIndex(load_range(start, end, folder)))
+
+
+def load_details(start, end, rows, columns=None, folder='.'):
+    """Fault Number and detail columns (free text, other milestones) for positions `rows` of load_range(start, end).
+
+    Read from the partition snapshots on demand and returned in the order of `rows`.
+    """
+    paths = partitions(start, end, folder)
+    rows = np.asarray(rows, dtype=np.int64)
+    lengths = loader.cached(('lengths',) + fingerprint(paths), lambda: tuple(loader.count_faults(path) for path in paths))
+    offsets = np.cumsum((0,) + lengths)
+    part = np.searchsorted(offsets, rows, side='right') - 1
+    order = np.argsort(part, kind='stable')
+    frames = [loader.load_details(path, rows[order][part[order] == i] - offsets[i], columns)
+              for i, path in enumerate(paths)]
+    return pd.concat(frames).iloc[np.argsort(order)]
+
+
+def load_schedules(start, end, folder='.'):
+    """Schedules for the months in [start, end]; None when no schedules_*.xlsx export covers them."""
+    paths = partitions(start, end, folder, SCHEDULE_FILE)
+    if not paths:
+        return None
+    return loader.cached(('schedules',) + fingerprint(paths),
+                         lambda: loader.concat([loader.load_schedules(path) for path in paths]))
+
+
+def load_join(start, end, folder='.'):
+    """Fault/schedule join index for the months in [start, end]; None without schedules."""
+    paths = partitions(start, end, folder, SCHEDULE_FILE)
+    if not paths:
+        return None
+    key = ('join',) + range_fingerprint(start, end, folder) + fingerprint(paths)
+    return loader.cached(key, lambda: schedules.JoinIndex(load_range(start, end, folder),
+                                                          load_schedules(start, end, folder)))
+
+
+def dashboard(start, end, building_trades=None, trade_categories=None, folder='.'):
+    """Dashboard over the months in [start, end] for a selection, all trades and categories by default.
+
+    This is the whole load -> derive -> filter -> aggregate path without any UI,
+    for batch jobs and scripts as well as the Streamlit page.
+    """
+    index = load_index(start, end, folder)
+    if building_trades is None:
+        building_trades = index.options('Building_Trade')
+    if trade_categories is None:
+        trade_categories = index.options('Trade_Category')
+    return pipeline.Dashboard(load_range(start, end, folder), index, load_cube(start, end, folder),
+                              range_fingerprint(start, end, folder), building_trades, trade_categories)
+
+
+def label(start, end):
+    if start == end:
+        return start.strftime('%b %Y')
+    return f"{start.strftime('%b %Y')} - {end.strftime('%b %Y')}"
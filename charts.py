@@ -0,0 +1,117 @@
+import hashlib
+
+import pandas as pd
+
+import cache
+import instrument
+
+MAX_FIGURES = 256
+
+line_style = dict(showline=True, linewidth=1, linecolor='#59656d')
+grid_style = dict(showgrid=True, gridwidth=0.1, gridcolor='#1f3b4d')
+
+# ------built figures by input hash, shared by every session------
+_figures = cache.LRU(MAX_FIGURES, name='figures')
+
+
+def digest(kind, data, **options):
+    """Hash of a figure's input data and styling options."""
+    sha1 = hashlib.sha1(f'{kind}{sorted(options.items())!r}'.encode())
+    for item in data:
+        item = item if isinstance(item, (pd.Series, pd.DataFrame)) else pd.Series(item)
+        sha1.update(pd.util.hash_pandas_object(item, index=True).to_numpy().tobytes())
+        if isinstance(item, pd.DataFrame):
+            sha1.update(repr(list(item.columns)).encode())
+    return sha1.hexdigest()
+
+
+def _bar(x, y, title, x_title, y_title, color, orientation):
+    import plotly.graph_objects as go
+
+    if orientation == 'h':
+        fig = go.Figure(data=[go.Bar(x=x, y=y, orientation='h')])
+        fig.update_xaxes(title_text=x_title, title_font_color=color, **grid_style, **line_style)
+        fig.update_yaxes(title_text=y_title, title_font_color=color, showgrid=False, **line_style)
+    else:
+        fig = go.Figure(data=[go.Bar(x=x, y=y, orientation='v', text=y)])
+        fig.update_xaxes(title_text=x_title, tickangle=-45, title_font_color=color, showgrid=False, **line_style)
+        fig.update_yaxes(title_text=y_title, title_font_color=color, **grid_style, **line_style)
+    fig.update_traces(marker_color=color, marker_line_color=color, marker_line_width=1)
+    fig.update_layout(title=title, plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def bar(x, y, title, x_title, y_title, color, orientation='v'):
+    """Single-colour bar chart; horizontal bars take values on x and labels on y."""
+    with instrument.timer('figure.bar'):
+        key = digest('bar', [x, y], title=title, x_title=x_title, y_title=y_title, color=color, orientation=orientation)
+        return _figures.get(key, lambda: _bar(x, y, title, x_title, y_title, color, orientation))
+
+
+def _stacked(matrix, title, x_title, color):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Bar(name=label, x=matrix.columns, y=matrix.loc[label]) for label in matrix.index])
+    fig.update_xaxes(title_text=x_title, tickangle=-45, title_font_color=color, showgrid=False, **line_style)
+    fig.update_yaxes(title_text='Number of Fault', title_font_color=color, **grid_style, **line_style)
+    fig.update_layout(barmode='stack', title=title, plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def stacked(matrix, title, x_title, color='#a2bffe'):
+    """Stacked bars from a (bucket x dimension) count matrix, one trace per bucket."""
+    with instrument.timer('figure.stacked'):
+        key = digest('stacked', [matrix], title=title, x_title=x_title, color=color)
+        return _figures.get(key, lambda: _stacked(matrix, title, x_title, color))
+
+
+def _pie(values, labels, title):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(values=values, labels=labels, hoverinfo='all', textinfo='label+percent+value',
+                                 textfont_size=10, textfont_color='white', textposition='inside', showlegend=False)])
+    fig.update_layout(title=title)
+    return fig
+
+
+def pie(values, labels, title):
+    with instrument.timer('figure.pie'):
+        key = digest('pie', [values, labels], title=title)
+        return _figures.get(key, lambda: _pie(values, labels, title))
+
+
+def _line(frame, title, x_title, y_title, color):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Scatter(name=name, x=frame.index, y=frame[name], mode='lines+markers') for name in frame.columns])
+    fig.update_xaxes(title_text=x_title, title_font_color=color, showgrid=False, **line_style)
+    fig.update_yaxes(title_text=y_title, title_font_color=color, **grid_style, **line_style)
+    fig.update_layout(title=title, plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def line(frame, title, x_title, y_title, color='#a2bffe'):
+    """One line per column of `frame` over its index."""
+    with instrument.timer('figure.line'):
+        key = digest('line', [frame], title=title, x_title=x_title, y_title=y_title, color=color)
+        return _figures.get(key, lambda: _line(frame, title, x_title, y_title, color))
+
+
+def _scatter(frame, x, y, title, x_title, y_title, color):
+    import plotly.graph_objects as go
+
+    text = [' / '.join(map(str, key)) if isinstance(key, tuple) else str(key) for key in frame.index]
+    fig = go.Figure(data=[go.Scatter(x=frame[x], y=frame[y], text=text, mode='markers',
+                                     hovertemplate='%{text}<br>%{x}, %{y}<extra></extra>')])
+    fig.update_traces(marker_color=color, marker_size=9)
+    fig.update_xaxes(title_text=x_title, title_font_color=color, **grid_style, **line_style)
+    fig.update_yaxes(title_text=y_title, title_font_color=color, **grid_style, **line_style)
+    fig.update_layout(title=title, plot_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+def scatter(frame, x, y, title, x_title, y_title, color='#a2bffe'):
+    """One marker per row of `frame`, labelled with its index."""
+    with instrument.timer('figure.scatter'):
+        key = digest('scatter', [frame[[x, y]]], x=x, y=y, title=title, x_title=x_title, y_title=y_title, color=color)
+        return _figures.get(key, lambda: _scatter(frame, x, y, title, x_title, y_title, color))
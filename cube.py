@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+import sla
+
+MISSING = ''
+
+cube_dims = ['Building_Trade', 'Trade_Category', 'Type_of_Fault', 'Building', 'Status',
+             'KPI_For_Responded', 'KPI_For_Recovered']
+
+statuses = ['Recovered', 'Outstanding', 'Cancelled']
+
+measures = ['Faults', 'Acknowledged_count', 'Acknowledged_sum(mins)', 'Recovered_count', 'Recovered_sum(mins)']
+
+freqs = {'Day': 'D', 'Week': 'W', 'Month': 'MS'}
+
+
+def with_missing(series):
+    """Categorical with missing values mapped to an explicit blank category, so groupby keeps them."""
+    series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if MISSING not in series.cat.categories:
+        series = series.cat.add_categories(MISSING)
+    return series.fillna(MISSING)
+
+
+def build(df):
+    """Counts and duration sums per (day x trade x category x fault type x building x status x KPI buckets)."""
+    cancelled = df['Cancel_Status'].notna()
+    completed = df['Work_Completed_Date'].notna()
+    status = np.select([cancelled, ~completed], ['Cancelled', 'Outstanding'], 'Recovered')
+
+    frame = pd.DataFrame({'Day': df.Reported_Date.dt.floor('D')}, index=df.index)
+    for dim in ['Building_Trade', 'Trade_Category', 'Type_of_Fault', 'Building']:
+        frame[dim] = with_missing(df[dim])
+    frame['Status'] = pd.Categorical(status, categories=statuses)
+    frame['KPI_For_Responded'] = with_missing(sla.bucket(df, 'responded'))
+    frame['KPI_For_Recovered'] = with_missing(sla.bucket(df, 'recovered'))
+    frame['Time_Acknowledged_mins'] = df.Time_Acknowledged_mins
+    frame['Time_Work_Recovered_mins'] = df.Time_Work_Recovered_mins
+
+    out = frame.groupby(['Day'] + cube_dims, observed=True).agg(
+        **{'Faults': ('Status', 'size'),
+           'Acknowledged_count': ('Time_Acknowledged_mins', 'count'),
+           'Acknowledged_sum(mins)': ('Time_Acknowledged_mins', 'sum'),
+           'Recovered_count': ('Time_Work_Recovered_mins', 'count'),
+           'Recovered_sum(mins)': ('Time_Work_Recovered_mins', 'sum')})
+    return out.reset_index()
+
+
+def select(cube, building_trades, trade_categories):
+    mask = cube.Building_Trade.isin(building_trades) & cube.Trade_Category.isin(trade_categories)
+    return cube if mask.all() else cube[mask]
+
+
+def cards(cube):
+    by_status = cube.groupby('Status', observed=False).Faults.sum()
+    return {'total': int(by_status.sum()),
+            'cancelled': int(by_status['Cancelled']),
+            'outstanding': int(by_status['Outstanding']),
+            'recovered': int(by_status['Recovered'])}
+
+
+def rollup(cube, freq='Day', by=()):
+    """Measures summed per Day/Week/Month period, optionally split by cube dimensions."""
+    keys = [pd.Grouper(key='Day', freq=freqs[freq])] + list(by)
+    return cube.groupby(keys, observed=True)[measures].sum()
+
+
+def trend(cube, freq='Day'):
+    """Fault volume per status and SLA compliance per period.
+
+    Compliance is the share of recovered faults that stayed out of the last
+    (open-ended) responded/recovered bucket.
+    """
+    volume = rollup(cube, freq, ['Status'])['Faults'].unstack('Status', fill_value=0)
+    volume = volume.reindex(columns=statuses, fill_value=0)
+
+    recovered = cube[cube.Status == 'Recovered']
+    periods = volume.index
+    compliance = pd.DataFrame(index=periods)
+    for name, kind in [('KPI_For_Responded', 'responded'), ('KPI_For_Recovered', 'recovered')]:
+        breached = recovered[name] == sla.labels(kind)[-1]
+        total = rollup(recovered, freq)['Faults'].reindex(periods, fill_value=0)
+        late = rollup(recovered[breached], freq)['Faults'].reindex(periods, fill_value=0)
+        compliance[f'{kind.capitalize()} within SLA(%)'] = (100*(1 - late/total.replace(0, np.nan))).round(1)
+    return {'volume': volume, 'compliance': compliance}
+
+
+def merge(cubes):
+    """Re-aggregate cubes built from chunks of one export into a single cube."""
+    df = pd.concat(cubes, ignore_index=True)
+    for dim in cube_dims:
+        df[dim] = df[dim].astype(pd.CategoricalDtype(statuses) if dim == 'Status' else 'category')
+    return df.groupby(['Day'] + cube_dims, observed=True)[measures].sum().reset_index()
+
+
+def patch(cube, removed, added):
+    """`cube` with the contributions of the `removed` fault rows taken out and those of `added` put in."""
+    parts = [cube]
+    if len(removed):
+        old = build(removed)
+        old[measures] = -old[measures]
+        parts.append(old)
+    if len(added):
+        parts.append(build(added))
+    if len(parts) == 1:
+        return cube
+    out = merge(parts)
+    return out[out.Faults > 0].reset_index(drop=True)
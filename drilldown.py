@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 50
+
+drill_dims = ['Building_Trade', 'Trade_Category', 'Type_of_Fault', 'Building']
+
+# ------label: compact frame column the rows can be sorted by------
+sort_cols = {'Reported Date': 'Reported_Date',
+             'Time to Acknowledge(mins)': 'Time_Acknowledged_mins',
+             'Time to Recover(mins)': 'Time_Work_Recovered_mins',
+             'Building Trade': 'Building_Trade',
+             'Trade Category': 'Trade_Category',
+             'Building': 'Building'}
+
+page_cols = ['Reported_Date', 'Building_Trade', 'Trade_Category', 'Type_of_Fault', 'Building', 'Level', 'Room',
+             'Impact', 'Cancel_Status', 'Time_Acknowledged_mins', 'Time_Work_Recovered_mins',
+             'KPI_For_Responded', 'KPI_For_Recovered']
+
+detail_cols = ['Location', 'Remarks']
+
+
+def order(series):
+    """(positions of the present values in ascending order, positions of the missing ones).
+
+    Categoricals sort by label, not by code. Built once per dataset and column,
+    so a drill-down only filters this order instead of sorting its rows.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        ranks = np.argsort(np.argsort(series.cat.categories.astype(str), kind='stable'), kind='stable')
+        missing = codes < 0
+        keys = ranks[codes]
+    else:
+        missing = series.isna().to_numpy()
+        keys = series.to_numpy()
+    present = np.flatnonzero(~missing)
+    return present[np.argsort(keys[present], kind='stable')], np.flatnonzero(missing)
+
+
+def select(ordered, mask, descending=False):
+    """Positions in `mask`, in the sort order of `ordered` = order(...); missing values always last."""
+    present, missing = ordered
+    present = present[mask[present]]
+    if descending:
+        present = present[::-1]
+    return np.concatenate([present, missing[mask[missing]]])
+
+
+def pages(total, size=PAGE_SIZE):
+    return max(1, -(-total//size))
+
+
+def page(rows, number, size=PAGE_SIZE):
+    """Positions on 1-based page `number`."""
+    return rows[(number - 1)*size:number*size]
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+filter_dims = ['Building_Trade', 'Trade_Category', 'Type_of_Fault', 'Site', 'Building', 'Impact']
+
+
+def compact(codes, n):
+    """Smallest signed integer dtype able to hold codes 0..n-1 and the -1 missing marker."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n < np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes
+
+
+class FilterIndex:
+    """Per-dataset code arrays for the sidebar dimensions.
+
+    A selection becomes one boolean lookup table per dimension gathered over a
+    compact code array, instead of string comparisons over the whole frame.
+    """
+
+    def __init__(self, df, dims=filter_dims):
+        self.size = len(df)
+        self.codes = {}
+        self.values = {}
+        self.complete = {}
+        for dim in dims:
+            codes, uniques = pd.factorize(df[dim])
+            self.codes[dim] = compact(codes, len(uniques))
+            self.values[dim] = {value: code for code, value in enumerate(uniques)}
+            self.complete[dim] = bool((codes >= 0).all())
+
+    def options(self, dim):
+        return list(self.values[dim])
+
+    def mask(self, selections):
+        """Boolean row mask for {dim: selected values}, AND across dimensions, OR within one."""
+        mask = np.ones(self.size, dtype=bool)
+        for dim, selected in selections.items():
+            lookup = self.values[dim]
+            wanted = list({lookup[value] for value in selected if value in lookup})
+            if len(wanted) == len(lookup) and self.complete[dim]:
+                continue
+            table = np.zeros(len(lookup) + 1, dtype=bool) # last slot is hit by the -1 missing code
+            table[wanted] = True
+            mask &= table[self.codes[dim]]
+        return mask
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import cache
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+# ------append one JSON line per script run to this file when set------
+LOG = os.environ.get('DASHBOARD_PROFILE_LOG')
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def peak_rss():
+    """Peak resident memory of this process in MiB, None where the platform doesn't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak/2**20 if sys.platform == 'darwin' else peak/2**10
+
+
+class Run:
+    """Stage timings of one script run, {stage: [calls, seconds]}, plus cache counters since it began.
+
+    Cache counters are process-wide, so with concurrent sessions the per-run
+    hits/misses also include the other sessions' lookups.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now(timezone.utc)
+        self.stages = {}
+        self._start = time.perf_counter()
+        self._baseline = {name: lru.stats() for name, lru in cache.caches.items()}
+
+    def add(self, stage, seconds):
+        totals = self.stages.setdefault(stage, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+
+    def record(self):
+        caches = {}
+        for name, lru in cache.caches.items():
+            stats = lru.stats()
+            before = self._baseline.get(name, {})
+            stats['run_hits'] = stats['hits'] - before.get('hits', 0)
+            stats['run_misses'] = stats['misses'] - before.get('misses', 0)
+            caches[name] = stats
+        return {'time': self.started.isoformat(timespec='seconds'),
+                'run': self.name,
+                'seconds': round(time.perf_counter() - self._start, 6),
+                'stages': {stage: {'calls': calls, 'seconds': round(seconds, 6)}
+                           for stage, (calls, seconds) in self.stages.items()},
+                'caches': caches,
+                'peak_rss_mib': peak_rss()}
+
+
+def begin(name='run'):
+    """Start timing a new run in this thread; Streamlit runs every session's script in its own thread."""
+    _local.run = Run(name)
+    return _local.run
+
+
+def current():
+    run = getattr(_local, 'run', None)
+    return run if run is not None else begin()
+
+
+@contextmanager
+def timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current().add(stage, time.perf_counter() - start)
+
+
+def finish(path=LOG):
+    """Record of the current run, appended to `path` as one JSON line when given."""
+    record = current().record()
+    if path:
+        with _log_lock, open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
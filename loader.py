@@ -0,0 +1,367 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import cache
+import cube
+import sla
+import snapshot
+
+cols = ['Fault Number', 'Building Trade', 'Trade Category',
+        'Type of Fault', 'Impact', 'Location', 'Cancel Status', 'Reported Date',
+        'Fault Acknowledged Date', 'Responded on Site Date', 'RA Conducted Date',
+        'Work Started Date', 'Work Completed Date',
+        'Other Trades Required Date', 'Cost Cap Exceed Date',
+        'Assistance Requested Date', 'Fault Reference',
+        'End User Priority', 'Incident Report', 'Remarks']
+
+parse_dates = ['Reported Date',
+               'Fault Acknowledged Date', 'Responded on Site Date', 'RA Conducted Date',
+               'Work Started Date', 'Work Completed Date',
+               'Other Trades Required Date', 'Cost Cap Exceed Date',
+               'Assistance Requested Date']
+
+time_cols = {'Time_Acknowledged_mins': 'Fault_Acknowledged_Date',
+             'Time_Site_Reached_mins': 'Responded_on_Site_Date',
+             'Time_Work_Started_mins': 'Work_Started_Date',
+             'Time_Work_Recovered_mins': 'Work_Completed_Date'}
+
+location_cols = ['Site', 'Building', 'Level', 'Room']
+
+category_cols = ['Building_Trade', 'Trade_Category', 'Type_of_Fault'] + location_cols
+
+# ------columns the dashboard computes on; the rest, free text included, is read from the snapshot on demand------
+frame_cols = category_cols + ['Impact', 'Cancel_Status', 'End_User_Priority',
+                              'Reported_Date', 'Fault_Acknowledged_Date', 'Work_Completed_Date'] + list(time_cols)
+frame_category_cols = category_cols + ['Impact', 'Cancel_Status', 'End_User_Priority']
+detail_cols = [col.replace(' ', '_') for col in cols[1:] if col.replace(' ', '_') not in frame_cols]
+
+# ------dtype of every other source column, shared by read_faults and the streaming reader------
+source_dtypes = {col: 'float64' if col == 'End User Priority' else str for col in cols if col not in parse_dates}
+
+# ------text columns of a derived export, the Fault Number index included------
+text_cols = [col.replace(' ', '_') if col != 'Fault Number' else col for col, dtype in source_dtypes.items()
+             if dtype is str] + location_cols
+
+schedule_dates = ['Start Date', 'End Date', 'Work Started Date', 'Work Completed Date']
+
+schedule_category_cols = ['Building_Trade', 'Trade_Category', 'Strategic_Partner', 'Frequency', 'Type', 'Scope',
+                          'Site', 'Building']
+
+MAX_ENTRIES = 32
+
+# ------exports above STREAM_BYTES are read in CHUNK_ROWS chunks through openpyxl's read-only mode------
+STREAM_BYTES = 32*2**20
+CHUNK_ROWS = 50000
+
+# ------shared in-process cache, one per worker, shared by every session------
+_cache = cache.LRU(MAX_ENTRIES, name='frames')
+_hashes = {}
+
+
+def fingerprint(path):
+    """(path, mtime, size, sha1) of a source file; the hash is only recomputed when mtime/size move."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    known = _hashes.get(path)
+    if known is not None and known[:-1] == key:
+        digest = known[-1]
+    else:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(block)
+        digest = sha1.hexdigest()
+        _hashes[path] = key + (digest,)
+    return key + (digest,)
+
+
+def read_faults(path):
+    df = pd.read_excel(path, header=1, index_col='Fault Number', usecols=cols, parse_dates=parse_dates,
+                       dtype=source_dtypes)
+    df.columns = df.columns.str.replace(' ', '_')
+    return df
+
+
+def categorize(df):
+    todo = [col for col in category_cols if not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if todo:
+        df[todo] = df[todo].astype('category')
+    return df
+
+
+def compact(df):
+    """The shared working frame, built from frame_cols only.
+
+    Dimensions are categorical, durations float32 and the KPI buckets int8
+    codes; a positional index replaces the Fault Number strings (see load_details).
+    """
+    df = df[frame_cols].reset_index(drop=True)
+    todo = [col for col in frame_category_cols if not isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if todo:
+        df[todo] = df[todo].astype('category')
+    df[list(time_cols)] = df[list(time_cols)].astype(np.float32)
+    df['KPI_For_Responded'] = sla.bucket(df, 'responded')
+    df['KPI_For_Recovered'] = sla.bucket(df, 'recovered')
+    return df
+
+
+def derive(df, categorical=True):
+    for name, col in time_cols.items():
+        df[name] = (df[col] - df.Reported_Date)/pd.Timedelta(minutes=1)
+
+    df1 = df.Location.str.split(pat=' > ', expand=True, n=4)
+    df1 = df1.reindex(columns=range(len(location_cols))).astype(object)
+    df1 = df1.where(df1.notna(), None) # missing parts stay text columns, not float64 NaN
+    df1.columns = location_cols
+    df = pd.concat([df, df1], axis=1)
+    return categorize(df) if categorical else df
+
+
+def _chunk(records):
+    """Typed like read_faults: parse_dates as datetimes, the rest per source_dtypes."""
+    df = pd.DataFrame.from_records(records, columns=cols)
+    for col in parse_dates:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col, dtype in source_dtypes.items():
+        values = df[col]
+        if dtype is str:
+            df[col] = values.where(values.isna(), values.astype(str)).astype(object)
+        else:
+            df[col] = pd.to_numeric(values, errors='coerce').astype(dtype)
+    df = df.set_index('Fault Number')
+    df.columns = df.columns.str.replace(' ', '_')
+    return derive(df, categorical=False)
+
+
+def iter_faults(path, chunksize=CHUNK_ROWS):
+    """Derived fault rows in frames of at most `chunksize`, so peak memory follows the chunk, not the file.
+
+    Text columns stay plain strings; categoricals are only built once the
+    whole snapshot is memory-mapped back.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(min_row=2, values_only=True)
+        header = next(rows)
+        positions = [header.index(col) for col in cols]
+        records = []
+        for row in rows:
+            record = [row[i] if i < len(row) else None for i in positions]
+            if all(value is None for value in record):
+                continue
+            records.append(record)
+            if len(records) == chunksize:
+                yield _chunk(records)
+                records = []
+        if records:
+            yield _chunk(records)
+    finally:
+        wb.close()
+
+
+def cube_digest(digest):
+    """Tag of a cube snapshot: its source file and the SLA config its KPI buckets were computed under."""
+    return f'{digest}+sla-{sla.fingerprint()}'
+
+
+def stream_ingest(path, digest, chunksize=CHUNK_ROWS):
+    """Append each derived chunk to the snapshot and fold it into the cube, then map frame_cols back."""
+    cubes = []
+
+    def chunks():
+        for chunk in iter_faults(path, chunksize):
+            cubes.append(cube.build(chunk))
+            yield chunk
+
+    snapshot.write_batches(chunks(), path, digest, text_cols)
+    snapshot.write(cube.merge(cubes), path, cube_digest(digest), kind='cube')
+    return snapshot.read(path, digest, columns=frame_cols)
+
+
+def concat(frames):
+    """pd.concat that keeps shared categorical columns categorical by unioning their categories.
+
+    Categories of different dtypes, e.g. the float64 ones of an all-missing
+    column next to strings, are unioned as objects.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames)
+    for col in frames[0].columns:
+        if all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames):
+            parts = [f[col].array for f in frames]
+            if len({part.categories.dtype for part in parts}) > 1:
+                parts = [pd.Categorical.from_codes(part.codes, part.categories.astype(object)) for part in parts]
+            df[col] = union_categoricals(parts)
+    return df
+
+
+def changed(previous, raw):
+    """Boolean mask over `raw` rows whose source columns differ from the same Fault Number in `previous`."""
+    old = previous.loc[raw.index, raw.columns]
+    diff = np.zeros(len(raw), dtype=bool)
+    for col in raw.columns:
+        a, b = old[col], raw[col]
+        if isinstance(a.dtype, pd.CategoricalDtype):
+            a = a.astype(object)
+        same = (a.to_numpy() == b.to_numpy()) | (a.isna().to_numpy() & b.isna().to_numpy())
+        diff |= ~same
+    return diff
+
+
+def apply_delta(previous, raw):
+    """Derived frame for `raw`, deriving only rows that are new or changed since `previous`.
+
+    Also returns the `previous` rows it replaced or dropped and the freshly
+    derived rows, so aggregates can be patched with just those.
+    """
+    known = raw.index.isin(previous.index)
+    stale = ~known
+    stale[known] = changed(previous, raw[known])
+    removed = previous[~previous.index.isin(raw.index[~stale])]
+    if not stale.any():
+        return previous.loc[raw.index], removed, previous.iloc[:0]
+    kept = previous.loc[raw.index[~stale]]
+    fresh = derive(raw[stale].copy())
+    return concat([kept, fresh]).loc[raw.index], removed, fresh
+
+
+def ingest(path):
+    """Read a fault export and derive it, with its cube when that can be patched instead of rebuilt.
+
+    If an older snapshot of the same file exists, only the delta is derived,
+    and the cube stored with it gets the delta's contributions swapped in;
+    otherwise the cube is None and has to be built from every row.
+    """
+    raw = read_faults(path)
+    previous = snapshot.read(path)
+    if (previous is None or not set(raw.columns) <= set(previous.columns)
+            or not previous.index.is_unique or not raw.index.is_unique):
+        return derive(raw), None
+    df, removed, fresh = apply_delta(previous, raw)
+    daily = snapshot.read(path, cube_digest(snapshot.tag(path)), kind='cube')
+    return df, None if daily is None else cube.patch(daily, removed, fresh)
+
+
+def read_schedules(path):
+    df = pd.read_excel(path, index_col='Schedule ID', parse_dates=schedule_dates)
+    df.columns = df.columns.str.replace(' ', '_')
+    df[schedule_category_cols] = df[schedule_category_cols].astype('category')
+    return df
+
+
+def derive_schedules(df):
+    df['Time_Work_Done_mins'] = (df.Work_Completed_Date - df.Work_Started_Date)/pd.Timedelta(minutes=1)
+    return df
+
+
+def store(path, digest, stream=None):
+    """Ingest a fault export into its snapshot and cube; exports over STREAM_BYTES are streamed."""
+    if stream is None:
+        stream = os.path.getsize(path) > STREAM_BYTES
+    if stream:
+        return stream_ingest(path, digest)
+    df, daily = ingest(path)
+    snapshot.write(df, path, digest)
+    snapshot.write(cube.build(df) if daily is None else daily, path, cube_digest(digest), kind='cube')
+    return df
+
+
+def convert(path, stream=None):
+    """Write the typed snapshot for a Fault_*.xlsx or schedules_*.xlsx export and return its path."""
+    digest = fingerprint(path)[-1]
+    if os.path.basename(path).lower().startswith('schedules_'):
+        return snapshot.write(read_schedules(path), path, digest)
+    store(path, digest, stream)
+    return snapshot.snapshot_path(path)
+
+
+def cached(key, build):
+    """Value for `key` from the shared frame cache, calling `build()` on a miss."""
+    return _cache.get(key, build)
+
+
+def _build_faults(path, digest):
+    df = snapshot.read(path, digest, columns=frame_cols)
+    if df is None:
+        df = store(path, digest)
+    return compact(df)
+
+
+def _build_cube(path, digest):
+    daily = snapshot.read(path, cube_digest(digest), kind='cube')
+    if daily is None:
+        daily = cube.build(load_faults(path))
+        snapshot.write(daily, path, cube_digest(digest), kind='cube')
+    return daily
+
+
+def _build_schedules(path, digest):
+    df = snapshot.read(path, digest)
+    if df is None:
+        df = read_schedules(path)
+        snapshot.write(df, path, digest)
+    return derive_schedules(df)
+
+
+def load_faults(path):
+    """Compact fault frame (see compact), re-parsed only when the file's content hash changes.
+
+    A cold worker memory-maps the Feather snapshot instead of the workbook; the
+    snapshot is written on first load and, when the export is re-downloaded,
+    updated with only the inserted or changed faults.
+    Callers share the returned frame and must not modify it in place.
+    """
+    digest = fingerprint(path)[-1]
+    return cached(digest, lambda: _build_faults(path, digest))
+
+
+def load_partition(path):
+    """load_faults(path) for one month of a wider range: the shared entry when there is one, else built uncached.
+
+    The range keeps its own concatenated copy, so caching every month too
+    would hold each fault row twice.
+    """
+    digest = fingerprint(path)[-1]
+    if digest in _cache:
+        return load_faults(path)
+    return _build_faults(path, digest)
+
+
+def count_faults(path):
+    """len(load_faults(path)), read from the snapshot instead of loading the frame."""
+    digest = fingerprint(path)[-1]
+    rows = snapshot.count(path, digest)
+    if rows is None:
+        store(path, digest)
+        rows = snapshot.count(path, digest)
+    return rows
+
+
+def load_cube(path):
+    """Daily aggregate cube of a fault export, materialized next to its snapshot at ingest time."""
+    digest = fingerprint(path)[-1]
+    return cached(('cube', digest), lambda: _build_cube(path, digest))
+
+
+def load_schedules(path):
+    """Preventive-maintenance schedules with their work duration, memory-mapped from the snapshot when current."""
+    digest = fingerprint(path)[-1]
+    return cached(('schedules', digest), lambda: _build_schedules(path, digest))
+
+
+def load_details(path, rows=None, columns=None):
+    """Fault Number plus detail_cols (or `columns`) for positions `rows` of load_faults(path), from the snapshot."""
+    digest = fingerprint(path)[-1]
+    df = snapshot.read(path, digest, columns=detail_cols if columns is None else columns, rows=rows)
+    if df is None:
+        store(path, digest)
+        df = snapshot.read(path, digest, columns=detail_cols if columns is None else columns, rows=rows)
+    return df
@@ -0,0 +1,139 @@
+import aggregate
+import cache
+import cube
+import drilldown
+import instrument
+import schedules
+
+recovered_cols = ['Site', 'Building', 'Level', 'Room', 'Building_Trade', 'Trade_Category', 'Type_of_Fault',
+                  'Time_Acknowledged_mins', 'Time_Site_Reached_mins', 'Time_Work_Started_mins', 'Time_Work_Recovered_mins',
+                  'KPI_For_Responded', 'KPI_For_Recovered']
+
+# ------bounded cardinality: top-N groups per chart, the rest folded into 'Other'------
+TOP_N = 10
+MAX_COLUMNS = 20
+
+MAX_BUNDLES = 256
+MAX_BUNDLE_BYTES = 256*2**20
+
+# ------aggregates per (dataset, selection), shared by every session------
+_bundles = cache.LRU(MAX_BUNDLES, MAX_BUNDLE_BYTES, name='aggregates')
+
+
+def select(index, building_trades, trade_categories):
+    """Row mask of a sidebar selection."""
+    return index.mask({'Building_Trade': building_trades, 'Trade_Category': trade_categories})
+
+
+def recovered(df, mask=None):
+    """Recovered, not cancelled faults within `mask` with their KPI buckets, taken from the compact frame in one copy."""
+    keep = df['Cancel_Status'].isna().to_numpy() & df['Work_Completed_Date'].notna().to_numpy()
+    if mask is not None:
+        keep &= mask
+    return df.loc[keep, recovered_cols]
+
+
+def kpi(df3, bucket):
+    return {'building': aggregate.fold_columns(aggregate.crosstab(df3, bucket, 'Building_Trade'), MAX_COLUMNS),
+            'category': aggregate.fold_columns(aggregate.crosstab(df3, bucket, 'Trade_Category'), MAX_COLUMNS)}
+
+
+def tier(df3, dim):
+    frame = aggregate.breakdown(df3, dim)
+    return {name: aggregate.fold(frame, dim, name, TOP_N) for name in aggregate.tier_metrics}
+
+
+def location(df3):
+    by_building = aggregate.fold(aggregate.breakdown(df3, 'Building', ['Fault_Recovered_count']),
+                                 'Building', 'Fault_Recovered_count', MAX_COLUMNS)
+    out = {'Building': by_building.set_index('Building').Fault_Recovered_count.iloc[::-1]}
+
+    # ------group on the location parts and label only the groups, Blank for missing Level------
+    level = df3.Level if '' in df3.Level.cat.categories else df3.Level.cat.add_categories('')
+    names = ['Fault_Recovered_count', 'Fault_Recovered_mean(hrs)', 'Fault_Recovered_sum(hrs)']
+    by_room = aggregate.breakdown(df3.assign(Level=level.fillna('')), ['Building', 'Level', 'Room'], names)
+    by_room.insert(0, 'New_Location', by_room.Building.astype(str)+'_'+by_room.Level.astype(str)+'_'+by_room.Room.astype(str))
+    by_room = by_room.drop(columns=['Building', 'Level', 'Room'])
+    for name in names:
+        out[name] = aggregate.fold(by_room, 'New_Location', name, TOP_N).set_index('New_Location')[name].iloc[::-1]
+    return out
+
+
+def tier1(df3):
+    frame = aggregate.breakdown(df3, 'Building_Trade')
+    return aggregate.fold(frame, 'Building_Trade', 'Fault_Acknowledged_count', MAX_COLUMNS)
+
+
+sections = {'responded': lambda df3: kpi(df3, 'KPI_For_Responded'),
+            'recovered': lambda df3: kpi(df3, 'KPI_For_Recovered'),
+            'tier1': tier1,
+            'tier2': lambda df3: tier(df3, 'Trade_Category'),
+            'tier3': lambda df3: tier(df3, 'Type_of_Fault'),
+            'location': location}
+
+
+class Dashboard:
+    """Aggregates for one (dataset, selection), each section computed on first use and memoized.
+
+    The key is the dataset fingerprint plus the sorted selection, so every
+    session viewing the same data shares the cached sections.
+    """
+
+    def __init__(self, df, index, daily, dataset, building_trades, trade_categories):
+        self.df = df
+        self.index = index
+        self.daily = daily
+        self.building_trades = building_trades
+        self.trade_categories = trade_categories
+        self.key = (dataset, tuple(sorted(building_trades, key=str)), tuple(sorted(trade_categories, key=str)))
+
+    def _base(self):
+        def build():
+            with instrument.timer('filter'):
+                mask = select(self.index, self.building_trades, self.trade_categories)
+            with instrument.timer('aggregate.base'):
+                return recovered(self.df, mask)
+        return _bundles.get(self.key + ('base',), build)
+
+    def _cube(self):
+        return _bundles.get(self.key + ('cube',), lambda: cube.select(self.daily, self.building_trades, self.trade_categories))
+
+    def cards(self):
+        with instrument.timer('aggregate.cards'):
+            return _bundles.get(self.key + ('cards',), lambda: cube.cards(self._cube()))
+
+    def trend(self, freq):
+        with instrument.timer('aggregate.trend'):
+            return _bundles.get(self.key + ('trend', freq), lambda: cube.trend(self._cube(), freq))
+
+    def schedules(self, join, dataset):
+        """Schedule status per selected trade and faults against schedules per (Building, Building_Trade).
+
+        Both sides follow the sidebar selection. Trade_Category only narrows the
+        schedules once deselected, as schedules use categories no fault has.
+        """
+        def build():
+            selections = {'Building_Trade': self.building_trades}
+            if set(self.index.options('Trade_Category')) - set(self.trade_categories):
+                selections['Trade_Category'] = self.trade_categories
+            schedule_mask = schedules.select(join.schedules, selections)
+            frame = schedules.correlate(join, select(self.index, self.building_trades, self.trade_categories), schedule_mask)
+            return {'trades': schedules.by_trade(join.schedules, schedule_mask),
+                    'correlation': frame.sort_values(['Faults', 'Schedules'], ascending=False),
+                    'r': frame.Faults.corr(frame.Schedules)}
+        with instrument.timer('aggregate.schedules'):
+            return _bundles.get(self.key + ('schedules', dataset), build)
+
+    def drill(self, dim, value, sort, descending=False):
+        """Row positions of the selected faults with `dim` == `value`, ordered by `sort`; page them with drilldown.page."""
+        def build():
+            with instrument.timer('filter'):
+                mask = select(self.index, self.building_trades, self.trade_categories) & self.index.mask({dim: [value]})
+            ordered = _bundles.get((self.key[0], 'order', sort), lambda: drilldown.order(self.df[sort]))
+            return drilldown.select(ordered, mask, descending)
+        with instrument.timer('aggregate.drill'):
+            return _bundles.get(self.key + ('drill', dim, value, sort, descending), build)
+
+    def section(self, name):
+        with instrument.timer(f'aggregate.{name}'):
+            return _bundles.get(self.key + (name,), lambda: sections[name](self._base()))
@@ -0,0 +1,140 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import pickle
+import sys
+import threading
+
+import pandas as pd
+
+import cache
+import catalog
+import cube
+import sla
+import snapshot
+import views
+
+PREWARM_DIR = os.path.join(snapshot.SNAPSHOT_DIR, 'prewarm')
+
+# ------selection-level entries only; per-row frames and positions and the selected cube are rebuilt on demand------
+SKIPPED = {'base', 'cube', 'drill'}
+
+_loaded = set()
+_lock = threading.Lock()
+
+
+def prewarm_path(dataset, folder='.'):
+    """Pickle of `dataset` rendered under the current SLA config; its KPI buckets are stale under any other."""
+    name = hashlib.sha1(repr((dataset, sla.fingerprint())).encode()).hexdigest()
+    return os.path.join(os.path.abspath(folder), PREWARM_DIR, name + '.pickle')
+
+
+def render(start, end, folder='.'):
+    """Dashboard over [start, end] with the default selection and every view of it, {name: view}."""
+    dashboard = catalog.dashboard(start, end, folder=folder)
+    out = {name: view(dashboard) for name, view in views.views.items()}
+    for freq in cube.freqs:
+        out[f'trend.{freq}'] = views.trend(dashboard, freq)
+    join = catalog.load_join(start, end, folder)
+    if join is not None:
+        out['schedules'] = views.schedules(dashboard, join, catalog.schedule_fingerprint(start, end, folder))
+    return dashboard, out
+
+
+def warm(start, end, folder='.'):
+    """Compute the default view of [start, end] and store its aggregates and figures for the app to load."""
+    dashboard, _ = render(start, end, folder)
+    views.cards(dashboard)
+    dataset = dashboard.key[0]
+    entries = {'bundles': {key: value for key, value in cache.caches['aggregates'].items()
+                           if key[0] == dataset and len(key) > 3 and key[3] not in SKIPPED},
+               'figures': dict(cache.caches['figures'].items())}
+    target = prewarm_path(dataset, folder)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = target + '.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, target)
+    return target
+
+
+def load(start, end, folder='.'):
+    """Seed the shared caches with the pre-rendered entries of [start, end], once per process.
+
+    The file is only found for the exact dataset and SLA config it was rendered
+    from, and it is written by warm() next to the snapshots, so it is trusted like them.
+    """
+    target = prewarm_path(catalog.range_fingerprint(start, end, folder), folder)
+    with _lock:
+        if target in _loaded or not os.path.exists(target):
+            return False
+        with open(target, 'rb') as f:
+            entries = pickle.load(f)
+        for key, value in entries['bundles'].items():
+            cache.caches['aggregates'].put(key, value)
+        for key, value in entries['figures'].items():
+            cache.caches['figures'].put(key, value)
+        _loaded.add(target)
+    return True
+
+
+def export(start, end, out, folder='.'):
+    """Write a self-contained index.html and a dashboard.json of every section of [start, end] into `out`."""
+    dashboard, sections = render(start, end, folder)
+    period = catalog.label(start, end)
+    cards = views.cards(dashboard)
+    os.makedirs(out, exist_ok=True)
+
+    data = {'period': period, 'cards': {label: value for label, value, color in cards}, 'sections': {}}
+    parts = [f'<h1>Dashboard Fault {html.escape(period)}</h1>',
+             ''.join(f'<div class="card"><h3>{html.escape(label)}</h3><h2 style="color: {color};">{value}</h2></div>'
+                     for label, value, color in cards)]
+    plotlyjs = True
+    for name, view in sections.items():
+        data['sections'][name] = {'title': view['title'],
+                                  'cards': {label: value for label, value, color in view.get('cards', [])},
+                                  'tables': [{'caption': caption, 'data': json.loads(frame.to_json(orient='split'))}
+                                             for caption, frame in view['tables']],
+                                  'figures': [json.loads(fig.to_json()) for fig in view['figures']]}
+        parts.append(f'<hr><h2>{html.escape(view["title"])}</h2>')
+        for caption, frame in view['tables']:
+            parts.append(f'<p>{html.escape(caption)}</p>' + frame.to_html())
+        for fig in view['figures']:
+            parts.append(f'<div class="figure">{fig.to_html(full_html=False, include_plotlyjs=plotlyjs)}</div>')
+            plotlyjs = False
+
+    style = ('body {font-family: sans-serif; background: #0e1117; color: #fafafa;} '
+             '.card {display: inline-block; width: 24%;} .figure {display: inline-block; width: 49%;} '
+             'table {border-collapse: collapse; font-size: small;} td, th {border: 1px solid #31333f; padding: 2px 6px;}')
+    with open(os.path.join(out, 'index.html'), 'w') as f:
+        f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>iSMM Dashboard {html.escape(period)}</title>'
+                f'<style>{style}</style></head><body>{"".join(parts)}</body></html>')
+    with open(os.path.join(out, 'dashboard.json'), 'w') as f:
+        json.dump(data, f)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-render the default dashboard view, e.g. from cron before reviews.')
+    parser.add_argument('--start', help="first month, e.g. 'Oct 2021' (default: the latest export)")
+    parser.add_argument('--end', help='last month (default: --start)')
+    parser.add_argument('--folder', default='.', help='folder holding the Fault_*/schedules_* exports')
+    parser.add_argument('--export', metavar='DIR', help='also write a static index.html and dashboard.json here')
+    args = parser.parse_args(argv)
+
+    months = list(catalog.discover(args.folder))
+    if not months:
+        parser.error(f'no Fault_*.xlsx export in {args.folder!r}')
+    start = pd.Period(args.start, freq='M') if args.start else months[-1]
+    end = pd.Period(args.end, freq='M') if args.end else start
+
+    print(f'{catalog.label(start, end)} -> {warm(start, end, args.folder)}')
+    if args.export:
+        print(f'{catalog.label(start, end)} -> {export(start, end, args.export, args.folder)}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+join_keys = ['Building', 'Building_Trade']
+
+schedule_statuses = ['Completed', 'Started', 'Not Started']
+
+
+def status(df):
+    started = df['Work_Started_Date'].notna()
+    completed = df['Work_Completed_Date'].notna()
+    return pd.Categorical(np.select([completed, started], schedule_statuses[:2], schedule_statuses[2]),
+                          categories=schedule_statuses)
+
+
+def _categories(faults, schedules, col):
+    values = []
+    for frame in (faults, schedules):
+        series = frame[col]
+        values.extend(series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else series.dropna().unique())
+    return pd.Index(pd.unique(pd.Series(values, dtype=object)))
+
+
+class JoinIndex:
+    """Fault and schedule rows grouped by their shared (Building, Building_Trade) key.
+
+    Both frames are coded against one key table once, so the per-key
+    measures are bincounts, not merges. Rows with a missing key join nothing.
+    """
+
+    def __init__(self, faults, schedules, keys=join_keys):
+        self.key_cols = list(keys)
+        self.faults = faults
+        self.schedules = schedules
+        categories = [_categories(faults, schedules, col) for col in self.key_cols]
+
+        flat = []
+        for frame in (faults, schedules):
+            code = np.zeros(len(frame), dtype=np.int64)
+            missing = np.zeros(len(frame), dtype=bool)
+            for col, values in zip(self.key_cols, categories):
+                codes = pd.Categorical(frame[col], categories=values).codes.astype(np.int64)
+                missing |= codes < 0
+                code = code*len(values) + codes
+            code[missing] = -1
+            flat.append(code)
+
+        present = np.unique(np.concatenate([code[code >= 0] for code in flat]))
+        self.size = len(present)
+        parts, rest = [], present
+        for values in reversed(categories):
+            rest, codes = np.divmod(rest, len(values))
+            parts.append(values[codes])
+        self.keys = pd.MultiIndex.from_arrays(parts[::-1], names=self.key_cols)
+
+        self.groups = [np.where(code >= 0, np.searchsorted(present, code), -1) for code in flat]
+
+    def counts(self, side, mask=None, weights=None):
+        group = self.groups[side]
+        keep = group >= 0 if mask is None else (group >= 0) & mask
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[keep]
+        return np.bincount(group[keep], weights=weights, minlength=self.size)
+
+
+def select(schedules, selections):
+    """Schedule row mask for {dim: selected values}, AND across dimensions; None when nothing is deselected."""
+    mask = None
+    for dim, selected in selections.items():
+        keep = schedules[dim].isin(selected).to_numpy()
+        mask = keep if mask is None else mask & keep
+    return mask
+
+
+def correlate(join, mask=None, schedule_mask=None):
+    """Faults against schedules per (Building, Building_Trade), over the fault rows in `mask` and schedule rows in `schedule_mask`."""
+    faults, schedules = join.faults, join.schedules
+    recovered = (faults['Cancel_Status'].isna() & faults['Work_Completed_Date'].notna()).to_numpy()
+    if mask is not None:
+        recovered = recovered & mask
+    recovered_mins = faults['Time_Work_Recovered_mins'].to_numpy(dtype=float)
+    recovered = recovered & ~np.isnan(recovered_mins)
+
+    done_mins = schedules['Time_Work_Done_mins'].to_numpy(dtype=float)
+    done = ~np.isnan(done_mins)
+    if schedule_mask is not None:
+        done = done & schedule_mask
+
+    out = pd.DataFrame({'Faults': join.counts(0, mask),
+                        'Fault_Recovered_count': join.counts(0, recovered),
+                        'Fault_Recovered_sum(hrs)': join.counts(0, recovered, np.where(recovered, recovered_mins, 0))/60,
+                        'Schedules': join.counts(1, schedule_mask),
+                        'Schedule_Completed_count': join.counts(1, done),
+                        'Schedule_Work_Done_sum(hrs)': join.counts(1, done, np.where(done, done_mins, 0))/60},
+                       index=join.keys)
+    out['Fault_Recovered_mean(hrs)'] = out['Fault_Recovered_sum(hrs)']/out.Fault_Recovered_count.replace(0, np.nan)
+    out['Schedule_Work_Done_mean(hrs)'] = out['Schedule_Work_Done_sum(hrs)']/out.Schedule_Completed_count.replace(0, np.nan)
+    return out[(out.Faults > 0) | (out.Schedules > 0)]
+
+
+def by_trade(schedules, mask=None):
+    """Schedule count per Building_Trade and status, over the rows in `mask`."""
+    if mask is not None:
+        schedules = schedules[mask]
+    frame = pd.DataFrame({'Building_Trade': schedules['Building_Trade'], 'Status': status(schedules)})
+    out = frame.groupby(['Status', 'Building_Trade'], observed=True).size().unstack('Building_Trade', fill_value=0)
+    out = out.reindex(index=schedule_statuses, fill_value=0)
+    return out[out.sum().sort_values(ascending=False).index]
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import aggregate
+
+# ------ships wall-clock; sla.example.json shows a business-hours contract to adapt------
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sla.json')
+
+# ------used when sla.json is missing: wall-clock minutes and the original KPI bins for every trade------
+defaults = {'clock': 'wall',
+            'business_hours': {'start': '00:00', 'end': '24:00', 'weekmask': 'Mon Tue Wed Thu Fri Sat Sun', 'holidays': []},
+            'kpis': {'responded': {'labels': aggregate.label_responded, 'default': aggregate.bin_responded[1:-1]},
+                     'recovered': {'labels': aggregate.label_recovered, 'default': aggregate.bin_recovered[1:-1]}}}
+
+# ------KPI: column the clock stops at, the clock starts at Reported_Date------
+kpi_dates = {'responded': 'Fault_Acknowledged_Date',
+             'recovered': 'Work_Completed_Date'}
+
+# ------per-value thresholds, a later dimension overrides an earlier one------
+override_dims = ['Building_Trade', 'End_User_Priority']
+
+
+def load_config(path=CONFIG):
+    if not os.path.exists(path):
+        return defaults
+    with open(path) as f:
+        return json.load(f)
+
+
+def _minutes(text):
+    hours, minutes = text.split(':')
+    return int(hours)*60 + int(minutes)
+
+
+def configure(new):
+    """Make `new`, e.g. load_config(path), the SLA config every function here works under."""
+    global config, opening, closing, calendar, holiday_years
+    hours = new['business_hours']
+    if not 0 <= _minutes(hours['start']) < _minutes(hours['end']) <= 24*60:
+        raise ValueError('SLA business hours must open before they close within one day')
+    config = new
+    opening, closing = _minutes(hours['start']), _minutes(hours['end'])
+    calendar = np.busdaycalendar(weekmask=hours['weekmask'], holidays=hours['holidays'])
+    # ------years the holiday list covers; any other year would silently be counted without public holidays------
+    holiday_years = sorted({int(day[:4]) for day in hours['holidays']})
+
+
+configure(load_config())
+
+
+def fingerprint():
+    """Short hash of the SLA config, so artefacts bucketed under another config are not reused."""
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def describe():
+    """One-line description of the SLA clock, for the UI."""
+    if config['clock'] != 'business':
+        return 'KPI buckets count wall-clock minutes.'
+    hours = config['business_hours']
+    holidays = f', public holidays {holiday_years[0]}-{holiday_years[-1]} excluded' if holiday_years else ''
+    return (f"KPI buckets count business minutes only: {hours['start']}-{hours['end']} "
+            f"{hours['weekmask']}{holidays} (sla.json); tier charts stay in wall-clock hours.")
+
+
+def uncovered(years):
+    """Of `years`, those the holiday list does not cover, when it lists any."""
+    if not holiday_years:
+        return []
+    return sorted(year for year in set(years) if not holiday_years[0] <= year <= holiday_years[-1])
+
+
+def labels(kind):
+    return list(config['kpis'][kind]['labels'])
+
+
+def business_minutes(start, end):
+    """Minutes between `start` and `end` counted only inside business hours on business days.
+
+    Whole days in between are counted with np.busday_count, the first and last
+    day are clipped to the opening hours. NaT or end before start gives NaN.
+    Warns when the dates run outside the years the holiday list covers.
+    """
+    start = np.asarray(start, dtype='datetime64[s]')
+    end = np.asarray(end, dtype='datetime64[s]')
+    out = np.full(len(start), np.nan)
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end >= start)
+    start, end = start[valid], end[valid]
+    if len(start):
+        years = uncovered(range(start.min().astype('datetime64[Y]').astype(int) + 1970,
+                                end.max().astype('datetime64[Y]').astype(int) + 1971))
+        if years:
+            warnings.warn(f'SLA config: no public holidays listed for {years}, counting them as business days',
+                          RuntimeWarning, stacklevel=2)
+
+    start_day, end_day = start.astype('datetime64[D]'), end.astype('datetime64[D]')
+    start_time = np.clip((start - start_day).astype(np.int64)/60, opening, closing)
+    end_time = np.clip((end - end_day).astype(np.int64)/60, opening, closing)
+    start_open = np.is_busday(start_day, busdaycal=calendar)
+    end_open = np.is_busday(end_day, busdaycal=calendar)
+    between = np.maximum(np.busday_count(start_day + 1, end_day, busdaycal=calendar), 0)
+
+    same_day = np.where(start_open, end_time - start_time, 0)
+    spanning = (np.where(start_open, closing - start_time, 0) + between*(closing - opening)
+                + np.where(end_open, end_time - opening, 0))
+    out[valid] = np.where(start_day == end_day, same_day, spanning)
+    return out
+
+
+def duration(df, kind):
+    """SLA clock in minutes from Reported_Date to the KPI's end date, wall-clock or business hours per config."""
+    start, end = df['Reported_Date'], df[kpi_dates[kind]]
+    if config['clock'] == 'business':
+        return business_minutes(start, end)
+    return ((end - start)/pd.Timedelta(minutes=1)).to_numpy(dtype=float)
+
+
+def _key(value):
+    return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+
+
+def thresholds(df, kind):
+    """Upper bound of each bucket but the last, a scalar or a per-row array each."""
+    rules = config['kpis'][kind]
+    edges = [float(edge) for edge in rules['default']]
+    for dim in override_dims:
+        table = rules.get(dim)
+        if not table or dim not in df:
+            continue
+        codes, categories = aggregate.codes(df[dim])
+        lookup = np.full((len(categories) + 1, len(edges)), np.nan) # last row is hit by the -1 missing code
+        for i, value in enumerate(categories):
+            if _key(value) in table:
+                lookup[i] = table[_key(value)]
+        picked = lookup[codes]
+        hit = ~np.isnan(picked[:, 0])
+        edges = [np.where(hit, picked[:, j], edge) for j, edge in enumerate(edges)]
+    return edges
+
+
+def codes(df, kind):
+    """int8 bucket code per fault, -1 where the KPI has not stopped yet."""
+    minutes = duration(df, kind)
+    out = np.zeros(len(minutes), dtype=np.int8)
+    for edge in thresholds(df, kind):
+        out += minutes > edge
+    out[np.isnan(minutes) | (minutes < 0)] = -1
+    return out
+
+
+def bucket(df, kind):
+    """KPI bucket ('responded' or 'recovered') of every fault in `df` as a categorical on its int8 codes."""
+    return pd.Series(pd.Categorical.from_codes(codes(df, kind), labels(kind)), index=df.index)
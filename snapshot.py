@@ -0,0 +1,149 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SNAPSHOT_DIR = '.snapshots'
+
+
+def snapshot_path(path, kind=None):
+    """.snapshots/<stem>.feather, or <stem>.<kind>.feather for a derived artefact such as the cube."""
+    folder, name = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(name)[0] + (f'.{kind}' if kind else '')
+    return os.path.join(folder, SNAPSHOT_DIR, stem + '.feather')
+
+
+def write(df, path, digest, kind=None):
+    """Store a typed frame as an Arrow/Feather snapshot tagged with the sha1 of its source file."""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    target = snapshot_path(path, kind)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_sha1'] = digest.encode()
+    table = table.replace_schema_metadata(metadata)
+    tmp = target + '.tmp'
+    feather.write_feather(table, tmp, compression='uncompressed')
+    os.replace(tmp, target)
+    return target
+
+
+def write_batches(frames, path, digest, strings=()):
+    """Stream frames with the same columns into one snapshot without holding them all in memory.
+
+    Columns named in `strings`, and any entirely missing in the first frame,
+    are typed as strings, so a later frame cannot contradict a type guessed
+    from the first one.
+    """
+    import pyarrow as pa
+
+    target = snapshot_path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = target + '.tmp'
+    schema = writer = None
+    try:
+        for df in frames:
+            if schema is None:
+                table = pa.Table.from_pandas(df, preserve_index=True)
+                fields = [field.with_type(pa.string()) if field.name in strings or pa.types.is_null(field.type) else field
+                          for field in table.schema]
+                metadata = dict(table.schema.metadata or {})
+                metadata[b'source_sha1'] = digest.encode()
+                schema = pa.schema(fields, metadata=metadata)
+                writer = pa.ipc.new_file(tmp, schema)
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=True))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f'{path} has no rows to snapshot')
+    os.replace(tmp, target)
+    return target
+
+
+def tag(path, kind=None):
+    """Source sha1 the snapshot of `path` was written with, None when it is missing."""
+    target = snapshot_path(path, kind)
+    if not os.path.exists(target):
+        return None
+    import pyarrow as pa
+
+    with pa.memory_map(target) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return metadata.get(b'source_sha1', b'').decode() or None
+
+
+def count(path, digest=None):
+    """Row count of the snapshot of `path` from its mapped table, without converting any column; None as read() would."""
+    target = snapshot_path(path)
+    if not os.path.exists(target):
+        return None
+    from pyarrow import feather
+
+    table = feather.read_table(target, memory_map=True)
+    if digest is not None and (table.schema.metadata or {}).get(b'source_sha1') != digest.encode():
+        return None
+    return table.num_rows
+
+
+def read(path, digest=None, kind=None, columns=None, rows=None):
+    """Memory-map the snapshot of `path`; None when it is missing or, given `digest`, built from other content.
+
+    `columns` and `rows` (positions) are taken from the mapped table, so only
+    those values are converted to pandas; the index columns are always kept.
+    """
+    target = snapshot_path(path, kind)
+    if not os.path.exists(target):
+        return None
+    from pyarrow import feather
+
+    table = feather.read_table(target, memory_map=True)
+    if digest is not None and (table.schema.metadata or {}).get(b'source_sha1') != digest.encode():
+        return None
+    if columns is not None:
+        index = [col for col in (table.schema.pandas_metadata or {}).get('index_columns', []) if isinstance(col, str)]
+        table = table.select([col for col in table.column_names if col in set(columns) or col in index])
+    if rows is not None:
+        table = table.take(rows)
+    return table.to_pandas()
+
+
+def _convert(path, stream):
+    import loader
+
+    start = time.perf_counter()
+    target = loader.convert(path, stream=stream)
+    return target, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert iSMM Fault_*/schedules_* exports into Feather snapshots.')
+    parser.add_argument('files', nargs='+', help='xlsx exports to convert')
+    parser.add_argument('--stream', action='store_true', default=None,
+                        help='read fault exports in row chunks (default: only exports over loader.STREAM_BYTES)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='worker processes parsing exports in parallel (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    jobs = max(1, min(args.jobs or 1, len(args.files)))
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_convert, path, args.stream): path for path in args.files}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                target, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f'[{done}/{len(futures)}] {path} FAILED: {e!r}', file=sys.stderr)
+            else:
+                size = os.path.getsize(target)/2**20
+                print(f'[{done}/{len(futures)}] {path} -> {target} ({size:.1f} MiB, {seconds:.1f}s)')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import copy
+
+import pandas as pd
+
+import catalog
+import loader
+import sla
+import views
+from test_loader import EXPORT, copy_export, edit_export
+
+
+def test_range_with_a_month_without_cancellations(tmp_path):
+    copy_export(tmp_path)
+    path = copy_export(tmp_path, 'Fault_Sep_2021.xlsx')
+
+    def edit(ws):
+        for row in range(3, ws.max_row + 1):
+            ws.cell(row, 8).value = None
+    edit_export(path, edit)
+
+    dashboard = catalog.dashboard(pd.Period('Sep 2021'), pd.Period('Oct 2021'), folder=str(tmp_path))
+    assert isinstance(dashboard.df.Cancel_Status.dtype, pd.CategoricalDtype)
+    assert dashboard.df.Cancel_Status.notna().sum() == 2
+    for view in views.views.values():
+        view(dashboard)
+    assert dict((label, value) for label, value, color in views.cards(dashboard))['Total'] == len(dashboard.df)
+
+
+def test_range_mixing_streamed_and_parsed_months(tmp_path, monkeypatch):
+    copy_export(tmp_path)
+    path = copy_export(tmp_path, 'Fault_Sep_2021.xlsx')
+    edit_export(path, lambda ws: setattr(ws.cell(3, 21), 'value', 'streamed')) # other content, so not the Oct frame
+    loader.store(path, loader.fingerprint(path)[-1], stream=True)
+
+    df = catalog.load_range(pd.Period('Sep 2021'), pd.Period('Oct 2021'), str(tmp_path))
+    priorities = loader.read_faults(EXPORT).End_User_Priority
+    assert df.End_User_Priority.astype(float).value_counts().to_dict() == (2*priorities.value_counts()).to_dict()
+
+    config = copy.deepcopy(sla.config)
+    config['kpis']['responded']['End_User_Priority'] = {'1': [1, 2, 3]}
+    monkeypatch.setattr(sla, 'config', config)
+    edges = sla.thresholds(df, 'responded')
+    assert (edges[0] == 1).sum() == 2*(priorities == 1).sum()
+
+
+def test_range_keeps_one_copy_of_its_rows(tmp_path):
+    paths = [copy_export(tmp_path, f'Fault_{month}_2021.xlsx') for month in ['Aug', 'Sep', 'Oct']]
+    for i, path in enumerate(paths[:2]):
+        edit_export(path, lambda ws: setattr(ws.cell(3, 21), 'value', f'month {i}'))
+    start, end, folder = pd.Period('Aug 2021'), pd.Period('Oct 2021'), str(tmp_path)
+
+    df = catalog.load_range(start, end, folder)
+    n = len(df)//3
+    details = catalog.load_details(start, end, [0, 3*n - 1, n + 5, 1], ['Remarks'], folder)
+    faults = loader.read_faults(EXPORT).index
+    assert details.index.tolist() == [faults[0], faults[n - 1], faults[5], faults[1]]
+    assert details.Remarks.iloc[0] == 'month 0'
+
+    # ------partition frames are neither kept nor reloaded for the offsets------
+    digests = {loader.fingerprint(path)[-1] for path in paths}
+    assert not digests & {key for key, value in loader._cache.items()}
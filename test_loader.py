@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import openpyxl
+import pandas as pd
+
+import cube
+import loader
+
+EXPORT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Fault_Oct_2021.xlsx')
+
+
+def copy_export(tmp_path, name='Fault_Oct_2021.xlsx'):
+    path = str(tmp_path/name)
+    shutil.copy(EXPORT, path)
+    return path
+
+
+def edit_export(path, edit):
+    """Apply `edit(worksheet)` to the export at `path`; the header is row 2, faults start on row 3."""
+    wb = openpyxl.load_workbook(path)
+    edit(wb.worksheets[0])
+    wb.save(path)
+
+
+def test_reingest_modified_export(tmp_path):
+    path = copy_export(tmp_path)
+    loader.load_faults(path)
+
+    def edit(ws):
+        ws.cell(3, 8).value = 'Cancelled'
+        row = [cell.value for cell in ws[4]]
+        row[1], row[6] = 'FID9999', 'Site A > Building B'
+        ws.append(row)
+    edit_export(path, edit)
+
+    df = loader.load_faults(path)
+    expected = loader.compact(loader.derive(loader.read_faults(path)))
+    pd.testing.assert_frame_equal(df.astype(object), expected.astype(object))
+    assert df.Cancel_Status.iloc[0] == 'Cancelled'
+    assert df.Level.isna().iloc[-1] and df.Building.iloc[-1] == 'Building B'
+
+    keys = ['Day'] + cube.cube_dims
+    patched = loader.load_cube(path).astype({dim: object for dim in cube.cube_dims}).sort_values(keys, ignore_index=True)
+    built = cube.build(loader.derive(loader.read_faults(path)))
+    built = built.astype({dim: object for dim in cube.cube_dims}).sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(patched, built, check_dtype=False)
+
+
+def test_stream_in_small_chunks(tmp_path):
+    path = copy_export(tmp_path)
+    digest = loader.fingerprint(path)[-1]
+    streamed = loader.compact(loader.stream_ingest(path, digest, chunksize=7))
+    expected = loader.compact(loader.derive(loader.read_faults(path)))
+    for col in loader.location_cols + ['Building_Trade', 'Cancel_Status', 'Time_Work_Recovered_mins', 'KPI_For_Recovered']:
+        assert streamed[col].astype(object).equals(expected[col].astype(object)), col
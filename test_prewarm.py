@@ -0,0 +1,15 @@
+import pandas as pd
+
+import prewarm
+import sla
+from test_loader import copy_export
+
+
+def test_prewarm_is_keyed_by_sla_config(tmp_path, monkeypatch):
+    copy_export(tmp_path)
+    month = pd.Period('Oct 2021')
+    prewarm.warm(month, month, str(tmp_path))
+    monkeypatch.setattr(sla, 'fingerprint', lambda: 'edited')
+    assert not prewarm.load(month, month, str(tmp_path))
+    monkeypatch.undo()
+    assert prewarm.load(month, month, str(tmp_path))
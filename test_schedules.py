@@ -0,0 +1,23 @@
+import os
+import shutil
+
+import pandas as pd
+
+import catalog
+import views
+from test_loader import EXPORT, copy_export
+
+SCHEDULES = os.path.join(os.path.dirname(EXPORT), 'schedules_Oct_2021.xlsx')
+
+
+def test_schedules_follow_trade_category(tmp_path):
+    copy_export(tmp_path)
+    shutil.copy(SCHEDULES, tmp_path/'schedules_Oct_2021.xlsx')
+    month, folder = pd.Period('Oct 2021'), str(tmp_path)
+    join = catalog.load_join(month, month, folder)
+    dataset = catalog.schedule_fingerprint(month, month, folder)
+
+    everything = views.schedules(catalog.dashboard(month, month, folder=folder), join, dataset)
+    htlv = views.schedules(catalog.dashboard(month, month, None, ['HTLV'], folder), join, dataset)
+    assert htlv['cards'][0][1] == (join.schedules.Trade_Category == 'HTLV').sum() < everything['cards'][0][1]
+    assert htlv['tables'][0][1].Schedules.sum() == htlv['cards'][0][1]
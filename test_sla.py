@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sla
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sla.example.json')
+
+
+@pytest.fixture
+def business():
+    """sla.example.json: 08:00-18:00 Mon-Fri with the 2021-2022 public holidays."""
+    shipped = sla.config
+    sla.configure(sla.load_config(EXAMPLE))
+    yield
+    sla.configure(shipped)
+
+
+def minutes(start, end):
+    return sla.business_minutes(pd.to_datetime(pd.Series(start)), pd.to_datetime(pd.Series(end)))
+
+
+def test_start_on_a_weekend(business):
+    # Saturday 10:00 to Monday 09:00: only Monday's first hour counts
+    assert minutes(['2021-10-02 10:00'], ['2021-10-04 09:00']).tolist() == [60]
+
+
+def test_holiday_in_between(business):
+    # Wednesday 17:00 to Friday 09:00 over Thursday 2021-11-04, a public holiday
+    assert minutes(['2021-11-03 17:00'], ['2021-11-05 09:00']).tolist() == [120]
+    assert minutes(['2021-11-02 17:00'], ['2021-11-04 09:00']).tolist() == [60 + 600]
+
+
+def test_outside_opening_hours(business):
+    assert minutes(['2021-10-05 06:00', '2021-10-05 19:00', '2021-10-05 07:00'],
+                   ['2021-10-05 20:00', '2021-10-06 07:00', '2021-10-05 07:30']).tolist() == [600, 0, 0]
+
+
+def test_end_before_start_or_missing(business):
+    out = minutes(['2021-10-05 10:00', None, '2021-10-05 10:00'], ['2021-10-05 09:00', '2021-10-05 10:00', None])
+    assert np.isnan(out).all()
+
+
+def test_dates_outside_the_holiday_calendar_warn(business):
+    with pytest.warns(RuntimeWarning, match='2023'):
+        minutes(['2023-01-03 09:00'], ['2023-01-03 10:00'])
+
+
+def test_override_precedence(monkeypatch):
+    config = dict(sla.config, kpis={'responded': {'labels': sla.labels('responded'), 'default': [10, 30, 60],
+                                                  'Building_Trade': {'Electrical': [1, 2, 3]},
+                                                  'End_User_Priority': {'1': [4, 5, 6]}}})
+    monkeypatch.setattr(sla, 'config', config)
+    df = pd.DataFrame({'Building_Trade': pd.Categorical(['Electrical', 'Electrical', 'Mechanical', 'Mechanical']),
+                       'End_User_Priority': [1.0, np.nan, 1.0, 2.0]})
+    edges = sla.thresholds(df, 'responded')
+    # End_User_Priority is applied after Building_Trade, so it wins where both match
+    assert np.asarray(edges[0]).tolist() == [4, 1, 4, 10]
+    assert np.asarray(edges[2]).tolist() == [6, 3, 6, 60]
@@ -0,0 +1,123 @@
+import pandas as pd
+
+import charts
+import drilldown
+import pipeline
+
+# ------(metric, title, y axis) per Tier 2/3 figure, top 10 each------
+tier_figures = [('Fault_Acknowledged_count', 'Count(Acknowledged)-Top 10', 'Count(Acknowledged)'),
+                ('Fault_Acknowledged_mean(hrs)', 'Mean Time Spent to Acknowledged(hrs)-Top 10', 'Mean Time Spent'),
+                ('Fault_Acknowledged_sum(hrs)', 'Total Time Spent to Acknowledged(hrs)-Top 10', 'Total Time Spent'),
+                ('Fault_Recovered_count', 'Count(Recovered)-Top 10', 'Count(Recovered)'),
+                ('Fault_Recovered_mean(hrs)', 'Mean Time Spent to Recovered(hrs)-Top 10', 'Mean Time Spent'),
+                ('Fault_Recovered_sum(hrs)', 'Total Time Spent to Recovered(hrs)-Top 10', 'Total Time Spent')]
+
+
+def cards(dashboard):
+    data = dashboard.cards()
+    return [('Total', data['total'], '#703bef'),
+            ('Cancelled', data['cancelled'], '#3c9992'),
+            ('Outstanding', data['outstanding'], 'red'),
+            ('Recovered', data['recovered'], '#4da409')]
+
+
+def kpi(dashboard, name, kind):
+    data = dashboard.section(name)
+    return {'title': f'KPI Monitoring ({kind})',
+            'tables': [(f'KPI({kind}) vs Building Trade', data['building']),
+                       (f'KPI({kind}) vs Trade Category', data['category'])],
+            'figures': [charts.stacked(data['building'], f'KPI Monitoring({kind}) vs Building Trade', 'Building Trade'),
+                        charts.stacked(data['category'], f'KPI Monitoring({kind}) vs Trade Category', 'Trade Category')]}
+
+
+def tier1(dashboard):
+    data = dashboard.section('tier1')
+    x = data['Building_Trade']
+    return {'title': 'Recovered Fault vs Building Trade-Tier 1 (Resource Allocation/Performance Monitoring)',
+            'tables': [],
+            'figures': [charts.pie(data.Fault_Acknowledged_count, x, 'Proportions of Building Trade(Acknowledged)'),
+                        charts.bar(x, data['Fault_Acknowledged_mean(hrs)'], 'Mean Time Spent to Acknowledged(hrs)',
+                                   'Building Trade', 'Mean Time Spent', '#f8481c'),
+                        charts.bar(x, data['Fault_Acknowledged_sum(hrs)'], 'Total Time Spent to Acknowledged(hrs)',
+                                   'Building Trade', 'Total Time Spent', '#2afeb7'),
+                        charts.pie(data.Fault_Recovered_count, x, 'Proportions of Building Trade(Recovered)'),
+                        charts.bar(x, data['Fault_Recovered_mean(hrs)'], 'Mean Time Spent to Recovered(hrs)',
+                                   'Building Trade', 'Mean Time Spent', '#ffb16d'),
+                        charts.bar(x, data['Fault_Recovered_sum(hrs)'], 'Total Time Spent to Recovered(hrs)',
+                                   'Building Trade', 'Total Time Spent', '#00ffff')]}
+
+
+def tier(dashboard, name, dim, x_title, title, colors):
+    data = dashboard.section(name)
+    figures = []
+    for (metric, figure_title, y_title), color in zip(tier_figures, colors):
+        top = data[metric]
+        figures.append(charts.bar(top[dim], top[metric], figure_title, x_title, y_title, color))
+    return {'title': title, 'tables': [], 'figures': figures}
+
+
+def location(dashboard):
+    data = dashboard.section('location')
+    specs = [('Building', 'Number of Fault vs Building', 'Number of Fault', 'Building', '#728f02'),
+             ('Fault_Recovered_count', 'Number of Fault vs Level-Top 10', 'Number of Fault', 'Level', '#516572'),
+             ('Fault_Recovered_mean(hrs)', 'Mean Time Spent to Recovered(hrs) vs Level-Top 10', 'Mean Time Spent',
+              'Level', '#efc0fe'),
+             ('Fault_Recovered_sum(hrs)', 'Total Time Spent to Recovered(hrs) vs Level-Top 10', 'Total Time Spent',
+              'Level', '#c7ac7d')]
+    return {'title': 'Recovered Fault by Location',
+            'tables': [],
+            'figures': [charts.bar(data[name].values, data[name].index, title, x_title, y_title, color, orientation='h')
+                        for name, title, x_title, y_title, color in specs]}
+
+
+def trend(dashboard, freq='Day'):
+    data = dashboard.trend(freq)
+    return {'title': 'Fault Trend',
+            'tables': [],
+            'figures': [charts.stacked(data['volume'].T, f'Number of Fault per {freq}', freq),
+                        charts.line(data['compliance'], f'KPI Compliance per {freq}', freq, 'Within SLA(%)')]}
+
+
+def schedules(dashboard, join, dataset):
+    data = dashboard.schedules(join, dataset)
+    trades = data['trades']
+    r = '-' if pd.isna(data['r']) else f"{data['r']:.2f}"
+    return {'title': 'Preventive Maintenance Schedules vs Fault',
+            'cards': [('Schedules', int(trades.values.sum()), '#703bef'),
+                      ('Completed', int(trades.loc['Completed'].sum()), '#4da409'),
+                      ('Faults vs Schedules (r)', r, '#3c9992')],
+            'tables': [('Fault vs Schedule per Building & Trade-Top 20',
+                        data['correlation'].head(pipeline.MAX_COLUMNS).round(2))],
+            'figures': [charts.stacked(trades, 'Schedules vs Building Trade', 'Building Trade'),
+                        charts.scatter(data['correlation'], 'Schedules', 'Faults', 'Fault vs Schedule per Building & Trade',
+                                       'Number of Schedule', 'Number of Fault', '#ff9408')]}
+
+
+def drill(dashboard, dim, value, sort, descending, number, details):
+    """One page of the faults behind a bar plus the page count; `details(rows)` gives the detail columns of positions `rows`.
+
+    Only the visible page is taken from the frame and read from the snapshots.
+    """
+    rows = dashboard.drill(dim, value, sort, descending)
+    visible = drilldown.page(rows, number)
+    frame = dashboard.df.take(visible)[drilldown.page_cols]
+    extra = details(visible)
+    frame.index = extra.index
+    return {'title': f'Faults with {dim.replace("_", " ")} {value}',
+            'total': len(rows),
+            'pages': drilldown.pages(len(rows)),
+            'tables': [(f'Page {number} of {drilldown.pages(len(rows))} ({len(rows)} faults)', pd.concat([frame, extra], axis=1))],
+            'figures': []}
+
+
+# ------sections built from the dashboard alone; trend also takes a period, schedules a join index------
+views = {'responded': lambda dashboard: kpi(dashboard, 'responded', 'Responded'),
+         'recovered': lambda dashboard: kpi(dashboard, 'recovered', 'Recovered'),
+         'tier1': tier1,
+         'tier2': lambda dashboard: tier(dashboard, 'tier2', 'Trade_Category', 'Trade Category',
+                                         'Recovered Fault vs Trade Category-Tier 2 (Resource Allocation/Performance Monitoring)',
+                                         ['#fe86a4', '#a55af4', '#087871', '#50a747', '#929901', '#ff9408']),
+         'tier3': lambda dashboard: tier(dashboard, 'tier3', 'Type_of_Fault', 'Type of Fault',
+                                         'Recovered Fault vs Type of Fault-Tier 3 (Resource Allocation/Performance Monitoring)',
+                                         ['#3778bf', '#20f986', '#cbf85f', '#a8ff04', '#ff796c', '#c071fe']),
+         'location': location}